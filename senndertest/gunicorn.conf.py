@@ -0,0 +1,16 @@
+import os
+
+
+wsgi_app = 'senndertest.wsgi'
+
+# A stream of updates stays open as long as its client is connected: with
+# gevent, a stream waiting for the next update is a paused greenlet instead
+# of a blocked thread, so a worker keeps many of them open while it serves
+# the other requests
+worker_class = 'gevent'
+worker_connections = int(os.environ.get('WORKER_CONNECTIONS', 1000))
+workers = int(os.environ.get('WEB_CONCURRENCY', 2))
+
+# The app is loaded by each worker once gevent patched the standard library,
+# so that the listener of the updates and the redis connections cooperate
+preload_app = False
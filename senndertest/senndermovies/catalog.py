@@ -0,0 +1,102 @@
+import json
+import sys
+from typing import Dict, Optional, Tuple
+
+import redis
+
+from django.conf import settings
+
+from .processing import conn, get_movies_with_people, read_cache
+
+
+class Person:
+    """A character, shared by all the films it appears in"""
+    __slots__ = ('name',)
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def __repr__(self):
+        return f'Person({self.name!r})'
+
+
+class Film:
+    """A film with the characters appearing in it"""
+    __slots__ = ('title', 'people')
+
+    def __init__(self, title: str, people: Tuple[Person, ...]):
+        self.title = title
+        self.people = people
+
+    def __repr__(self):
+        return f'Film({self.title!r})'
+
+
+class Catalog:
+    """
+    All the films of a version of the movies with people. The names are
+    interned and each person is a single record whatever the number of
+    films it appears in.
+    """
+    __slots__ = ('version', 'films')
+
+    def __init__(self, version: Optional[str], films: Tuple[Film, ...]):
+        self.version = version
+        self.films = films
+
+    @classmethod
+    def from_payload(
+        cls,
+        payload: Dict[str, list],
+        version: Optional[str] = None,
+    ) -> 'Catalog':
+        """Build a catalog from a dict of characters indexed by film name"""
+        people = {}
+        films = []
+        for title, names in payload.items():
+            film_people = []
+            for name in names:
+                person = people.get(name)
+                if person is None:
+                    person = people[name] = Person(sys.intern(name))
+                film_people.append(person)
+            films.append(Film(sys.intern(title), tuple(film_people)))
+        return cls(version, tuple(films))
+
+    def as_dict(self) -> Dict[str, list]:
+        """Get the catalog as a dict of characters indexed by film name"""
+        return {
+            film.title: [person.name for person in film.people]
+            for film in self.films
+        }
+
+
+# Catalog of the current version of the cache, built once per process
+current_catalog = Catalog(None, ())
+
+
+def get_catalog(redis_conn: redis.StrictRedis = conn) -> Catalog:
+    """
+    Get the catalog of all the movies with the characters associated with it.
+    It is only rebuilt when the version of the cache changed, otherwise the
+    catalog already built by the process is returned without reading or
+    parsing the payload.
+    """
+    global current_catalog
+    version = redis_conn.hget(
+        settings.REDIS_HASH_CACHE,
+        settings.REDIS_HASH_CACHE_KEY
+    )
+    if version and version.decode('utf-8') == current_catalog.version:
+        return current_catalog
+
+    version, raw_payload = read_cache(redis_conn)
+    payload = json.loads(raw_payload.decode('utf-8')) if raw_payload else {}
+    if not payload:
+        # Built without version after a refill, it is built again from the
+        # cache by the next request so that its version can be trusted
+        payload = get_movies_with_people(redis_conn)
+        version = None
+    catalog = Catalog.from_payload(payload, version)
+    current_catalog = catalog
+    return catalog
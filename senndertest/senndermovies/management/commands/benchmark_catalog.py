@@ -0,0 +1,77 @@
+import json
+import random
+import tracemalloc
+
+from django.core.management.base import BaseCommand
+
+from senndermovies.catalog import Catalog
+
+
+def build_synthetic_payload(nb_films: int, nb_people: int, films_per_person: int):  # noqa
+    """
+    Build a dict of characters indexed by film name as big as required,
+    each character appearing in `films_per_person` random films.
+    """
+    randomizer = random.Random(0)
+    titles = [f'Synthetic film {index}' for index in range(nb_films)]
+    payload = {title: [] for title in titles}
+    for index in range(nb_people):
+        name = f'Synthetic person {index}'
+        for title in randomizer.sample(titles, films_per_person):
+            payload[title].append(name)
+    return payload
+
+
+def measure(build):
+    """
+    Get the memory retained by the result of `build` and the peak of memory
+    allocated while building it, in bytes.
+    """
+    tracemalloc.start()
+    result = build()
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return retained, peak
+
+
+class Command(BaseCommand):
+    help = (
+        'Compares the memory allocated on every request by the movies with '
+        'people parsed as plain dicts with the memory held by each worker '
+        'for the catalog of a version, for a synthetic dataset'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--films', type=int, default=2000)
+        parser.add_argument('--people', type=int, default=50000)
+        parser.add_argument('--films-per-person', type=int, default=5)
+
+    def handle(self, *args, **options):
+        raw_payload = json.dumps(build_synthetic_payload(
+            options['films'],
+            options['people'],
+            options['films_per_person'],
+        ))
+        self.stdout.write(
+            f"{options['films']} films, {options['people']} people, "
+            f"{options['films_per_person']} films per person, "
+            f"payload of {len(raw_payload) / 2 ** 20:.1f} MiB"
+        )
+
+        # The plain dicts were parsed on every request and released after it
+        _, dict_peak = measure(lambda: json.loads(raw_payload))
+        # The parsed payload is only needed while building the catalog
+        catalog_retained, catalog_peak = measure(
+            lambda: Catalog.from_payload(json.loads(raw_payload))
+        )
+
+        self.stdout.write(self.style.SUCCESS(
+            f'avoided on every request: {dict_peak / 2 ** 20:.1f} MiB '
+            'allocated to parse the plain dicts'
+        ))
+        self.stdout.write(
+            f'held by each worker: {catalog_retained / 2 ** 20:.1f} MiB '
+            f'for the catalog of a version, built once with a peak of '
+            f'{catalog_peak / 2 ** 20:.1f} MiB'
+        )
@@ -0,0 +1,62 @@
+# Generated by Django 3.1.14 on 2026-10-19 17:12
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Casting',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='Person',
+            fields=[
+                ('id', models.CharField(max_length=36, primary_key=True, serialize=False)),
+                ('name', models.CharField(db_index=True, max_length=255)),
+                ('rank', models.PositiveIntegerField(db_index=True)),
+            ],
+            options={
+                'ordering': ['rank'],
+            },
+        ),
+        migrations.CreateModel(
+            name='Film',
+            fields=[
+                ('id', models.CharField(max_length=36, primary_key=True, serialize=False)),
+                ('title', models.CharField(db_index=True, max_length=255)),
+                ('rank', models.PositiveIntegerField(db_index=True)),
+                ('people', models.ManyToManyField(related_name='films', through='senndermovies.Casting', to='senndermovies.Person')),
+            ],
+            options={
+                'ordering': ['rank'],
+            },
+        ),
+        migrations.AddField(
+            model_name='casting',
+            name='film',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='castings', to='senndermovies.film'),
+        ),
+        migrations.AddField(
+            model_name='casting',
+            name='person',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='castings', to='senndermovies.person'),
+        ),
+        migrations.AddIndex(
+            model_name='casting',
+            index=models.Index(fields=['person', 'film'], name='senndermovi_person__85b5b7_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='casting',
+            constraint=models.UniqueConstraint(fields=('film', 'person'), name='unique_casting'),
+        ),
+    ]
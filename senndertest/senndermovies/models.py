@@ -0,0 +1,62 @@
+from django.db import models
+
+
+class Film(models.Model):
+    """A film of the ghibli API identified by its id in the API"""
+    id = models.CharField(primary_key=True, max_length=36)
+    title = models.CharField(max_length=255, db_index=True)
+    # Position of the film in the API response
+    rank = models.PositiveIntegerField(db_index=True)
+    people = models.ManyToManyField(
+        'Person',
+        through='Casting',
+        related_name='films',
+    )
+
+    class Meta:
+        ordering = ['rank']
+
+    def __str__(self):
+        return self.title
+
+
+class Person(models.Model):
+    """A character of the ghibli API identified by its id in the API"""
+    id = models.CharField(primary_key=True, max_length=36)
+    name = models.CharField(max_length=255, db_index=True)
+    # Position of the person in the API response
+    rank = models.PositiveIntegerField(db_index=True)
+
+    class Meta:
+        ordering = ['rank']
+
+    def __str__(self):
+        return self.name
+
+
+class Casting(models.Model):
+    """The membership of a person to a film"""
+    film = models.ForeignKey(
+        Film,
+        on_delete=models.CASCADE,
+        related_name='castings',
+    )
+    person = models.ForeignKey(
+        Person,
+        on_delete=models.CASCADE,
+        related_name='castings',
+    )
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['film', 'person'],
+                name='unique_casting',
+            ),
+        ]
+        indexes = [
+            models.Index(fields=['person', 'film']),
+        ]
+
+    def __str__(self):
+        return f'{self.person_id} in {self.film_id}'
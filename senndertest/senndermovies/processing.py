@@ -1,27 +1,356 @@
+import hashlib
+import logging
+import random
 import redis
 import requests
 import json
-from typing import Dict
+from typing import Dict, List, Optional, Tuple, Union
 
 from django.conf import settings
+from django.db import DatabaseError, transaction
+from django.db.models import Count, Prefetch
+
+from .models import Casting, Film, Person
+from .ratelimit import UpstreamRateLimited, acquire_upstream_call
 
 
 conn = redis.StrictRedis(settings.REDIS_HOST)
+logger = logging.getLogger(__name__)
+
+GHIBLI_API = 'https://ghibliapi.herokuapp.com'
 
 
-def get_movies_with_id() -> Dict[str, str]:
+def request_upstream(
+    endpoint: str,
+    headers: Optional[Dict[str, str]] = None,
+    redis_conn: redis.StrictRedis = conn,
+) -> requests.Response:
     """
-    Get all the movies from the ghibli API.
-    It returns a dictionnary containing all films name indexed by id
-    if the API returns a valid result. Otherwise it returns an empty dict.
+    Request an endpoint of the ghibli API within its rate limit.
+    It raises UpstreamRateLimited instead of waiting if the limit is reached.
+    """
+    if not acquire_upstream_call(endpoint, redis_conn):
+        raise UpstreamRateLimited(endpoint)
+    return requests.get(f'{GHIBLI_API}/{endpoint}', headers=headers)
+
+
+def parse_movies_with_id(raw_movies: list) -> Dict[str, str]:
+    """
+    Parse the films of the ghibli API into a dictionnary containing
+    all films name indexed by id.
     """
-    response = requests.get(
-        'https://ghibliapi.herokuapp.com/films'
-    )
-    raw_movies = response.json() if response.status_code == 200 else []
     return {movie['id']: movie['title'] for movie in raw_movies}
 
 
+def join_movies_with_people(
+    movies_by_id: Dict[str, str],
+    people_w_movie: list,
+) -> Dict[str, list]:
+    """
+    Join the people of the ghibli API with the movies.
+    It returns the result as a dictionnary of characters indexed by film name
+    if there are movies. Otherwise it returns an empty dict.
+    """
+    movies = {}
+    if movies_by_id:
+        movies = {name: [] for id, name in movies_by_id.items()}
+        for person in people_w_movie:
+            # Sometime the API send back a wrong id without contextual
+            # information and impossible to reach by id with the people API
+            if all(key in person for key in ("films", "name")):
+                for movie in person['films']:
+                    movie_id = movie.split('/')[-1]
+                    movie_name = movies_by_id[movie_id]
+                    if movie_name in movies:
+                        movies[movie_name].append(person['name'])
+                    else:
+                        movies[movie_name] = [person['name']]
+    return movies
+
+
+def upsert_rows(model, rows: Dict[str, dict]) -> None:
+    """
+    Synchronize the table of a model with rows indexed by primary key:
+    only the new rows are inserted, the changed rows updated
+    and the missing rows deleted.
+    """
+    existing_rows = model.objects.in_bulk()
+    new_rows = []
+    changed_rows = []
+    for pk, fields in rows.items():
+        row = existing_rows.get(pk)
+        if row is None:
+            new_rows.append(model(pk=pk, **fields))
+        elif any(getattr(row, name) != value for name, value in fields.items()):  # noqa
+            for name, value in fields.items():
+                setattr(row, name, value)
+            changed_rows.append(row)
+
+    model.objects.bulk_create(new_rows, batch_size=500)
+    if changed_rows:
+        model.objects.bulk_update(
+            changed_rows,
+            list(next(iter(rows.values()))),
+            batch_size=500,
+        )
+    removed_pks = [pk for pk in existing_rows if pk not in rows]
+    for start in range(0, len(removed_pks), 500):
+        model.objects.filter(pk__in=removed_pks[start:start + 500]).delete()
+
+
+def store_catalog(raw_movies: list, raw_people: list) -> None:
+    """
+    Store the films and the people of the ghibli API in the database,
+    writing only the rows that changed since the last refill.
+    """
+    films = {
+        movie['id']: {'title': movie['title'], 'rank': rank}
+        for rank, movie in enumerate(raw_movies)
+    }
+    people = {}
+    castings = set()
+    for rank, person in enumerate(raw_people):
+        # Same as the cache, people without contextual information are ignored
+        if not all(key in person for key in ("id", "films", "name")):
+            continue
+        people[person['id']] = {'name': person['name'], 'rank': rank}
+        for movie in person['films']:
+            movie_id = movie.split('/')[-1]
+            if movie_id in films:
+                castings.add((movie_id, person['id']))
+
+    with transaction.atomic():
+        upsert_rows(Film, films)
+        upsert_rows(Person, people)
+        existing_castings = {
+            (film_id, person_id): pk
+            for pk, film_id, person_id in Casting.objects.values_list(
+                'pk', 'film_id', 'person_id'
+            )
+        }
+        Casting.objects.bulk_create(
+            [
+                Casting(film_id=film_id, person_id=person_id)
+                for film_id, person_id in castings - existing_castings.keys()
+            ],
+            batch_size=500,
+        )
+        removed_pks = [
+            pk for casting, pk in existing_castings.items()
+            if casting not in castings
+        ]
+        for start in range(0, len(removed_pks), 500):
+            Casting.objects.filter(
+                pk__in=removed_pks[start:start + 500]
+            ).delete()
+
+
+def sync_catalog(raw_movies: list, raw_people: list) -> bool:
+    """
+    Store the films and the people of the ghibli API in the database
+    without failing the refill of the cache if the database is unavailable.
+    It returns True if the catalog was stored, False otherwise.
+    """
+    try:
+        store_catalog(raw_movies, raw_people)
+    except DatabaseError:
+        logger.exception('The catalog could not be stored in the database')
+        return False
+    return True
+
+
+def is_catalog_stored() -> bool:
+    """
+    Check if films are stored in the database. It returns True if the
+    database is unavailable since nothing could be stored anyway.
+    """
+    try:
+        return Film.objects.exists()
+    except DatabaseError:
+        logger.exception('The catalog could not be read from the database')
+        return True
+
+
+def get_stored_movies_with_people(min_people: int = 0) -> Dict[str, list]:
+    """
+    Get the movies with the characters associated with it from the database
+    in the order of the ghibli API, optionally only the movies with at least
+    `min_people` characters.
+    It returns an empty dict if nothing was stored yet.
+    """
+    films = Film.objects.annotate(
+        nb_people=Count('castings'),
+    ).filter(
+        nb_people__gte=min_people,
+    ).order_by(
+        'rank',
+    ).prefetch_related(
+        Prefetch('people', queryset=Person.objects.only('name', 'rank')),
+    )
+    return {
+        film.title: [person.name for person in film.people.all()]
+        for film in films
+    }
+
+
+UPSTREAM_VALIDATORS = tuple(
+    f'{endpoint}_{name}'
+    for endpoint in ('films', 'people')
+    for name in ('etag', 'last_modified', 'hash')
+)
+
+
+def get_upstream_state(
+    redis_conn: redis.StrictRedis = conn,
+) -> Dict[str, bytes]:
+    """
+    Get the validators and the bodies of the ghibli API responses used for
+    the last refill, the serialized payload built from them and the version
+    of the catalog stored in the database.
+    Unlike the cache, this state never expires so that it can be compared
+    with the API on every refill. It returns an empty dict if it doesn't exist.
+    """
+    state = redis_conn.hgetall(settings.REDIS_HASH_UPSTREAM)
+    return {key.decode('utf-8'): value for key, value in state.items()}
+
+
+def get_stored_validators(
+    redis_conn: redis.StrictRedis = conn,
+) -> Dict[str, bytes]:
+    """
+    Get the validators of the ghibli API responses used for the last refill
+    without the bodies and the payload of the upstream state.
+    It returns an empty dict if they can't be used because the bodies or the
+    payload they validate aren't stored.
+    """
+    pipeline = redis_conn.pipeline(transaction=False)
+    pipeline.hmget(settings.REDIS_HASH_UPSTREAM, *UPSTREAM_VALIDATORS)
+    for field in ('payload', 'films_body', 'people_body'):
+        pipeline.hexists(settings.REDIS_HASH_UPSTREAM, field)
+    values, *stored = pipeline.execute()
+    if not all(stored):
+        return {}
+    return {
+        field: value
+        for field, value in zip(UPSTREAM_VALIDATORS, values)
+        if value is not None
+    }
+
+
+def get_upstream_validators(
+    endpoint: str,
+    response: requests.Response,
+) -> Dict[str, str]:
+    """
+    Get the validators of a ghibli API response indexed by endpoint:
+    its ETag and Last-Modified headers when provided and,
+    as a fallback, a hash of its content.
+    """
+    validators = {
+        f'{endpoint}_hash': hashlib.sha256(response.content).hexdigest(),
+    }
+    for header, name in (('ETag', 'etag'), ('Last-Modified', 'last_modified')):  # noqa
+        if header in response.headers:
+            validators[f'{endpoint}_{name}'] = response.headers[header]
+    return validators
+
+
+def get_catalog_version(
+    upstream_state: Dict[str, Union[str, bytes]],
+) -> str:
+    """
+    Get the version of the catalog built from the bodies of an upstream
+    state as the hashes of their contents.
+    """
+    return ':'.join(
+        content_hash.decode('utf-8')
+        if isinstance(content_hash, bytes) else content_hash
+        for content_hash in (
+            upstream_state['films_hash'],
+            upstream_state['people_hash'],
+        )
+    )
+
+
+def get_if_modified(
+    endpoint: str,
+    state: Dict[str, bytes],
+    redis_conn: redis.StrictRedis = conn,
+) -> Tuple[requests.Response, bool]:
+    """
+    Request an endpoint of the ghibli API conditionally to the validators
+    of the upstream state.
+    It returns the response and False if the content didn't change since the
+    last refill (304 or same content hash), True otherwise.
+    """
+    headers = {}
+    etag = state.get(f'{endpoint}_etag')
+    if etag:
+        headers['If-None-Match'] = etag.decode('utf-8')
+    last_modified = state.get(f'{endpoint}_last_modified')
+    if last_modified:
+        headers['If-Modified-Since'] = last_modified.decode('utf-8')
+
+    response = request_upstream(endpoint, headers, redis_conn)
+    if response.status_code == 304:
+        return response, False
+
+    content_hash = state.get(f'{endpoint}_hash')
+    modified = not (
+        response.status_code == 200
+        and content_hash is not None
+        and hashlib.sha256(response.content).hexdigest()
+        == content_hash.decode('utf-8')
+    )
+    return response, modified
+
+
+# The pointer to the current version and the payload of that version are
+# read in a single round trip, see `publish_cache_version`
+READ_CACHE_SCRIPT = """
+local version = redis.call('HGET', KEYS[1], ARGV[1])
+if not version then
+    return {false, false}
+end
+return {version, redis.call('GET', KEYS[1] .. ':' .. version)}
+"""
+# Registered once, the client given on each call is only used to run it
+read_cache_script = conn.register_script(READ_CACHE_SCRIPT)
+
+
+def get_cache_version_key(version: str) -> str:
+    """Get the key of the cache storing the payload of a version"""
+    return f'{settings.REDIS_HASH_CACHE}:{version}'
+
+
+def get_cache_life_milliseconds() -> int:
+    """
+    Get the life of a cache version, randomly shortened by up to
+    `CACHE_JITTER_RATIO` so that the refills of the workers, keys and regions
+    don't all happen at the same time.
+    """
+    jitter = 1 - random.uniform(0, float(settings.CACHE_JITTER_RATIO))
+    return max(1, int(float(settings.CACHE_LIFE_SECONDS) * 1000 * jitter))
+
+
+def read_cache(
+    redis_conn: redis.StrictRedis = conn,
+) -> Tuple[Optional[str], Optional[bytes]]:
+    """
+    Get the current version of the cache and its serialized payload
+    if they exist, else returns (None, None).
+    """
+    version, raw_payload = read_cache_script(
+        keys=[settings.REDIS_HASH_CACHE],
+        args=[settings.REDIS_HASH_CACHE_KEY],
+        client=redis_conn,
+    )
+    return (
+        version.decode('utf-8') if version else None,
+        raw_payload or None,
+    )
+
+
 def get_cached_movies_with_people(
     redis_conn: redis.StrictRedis = conn,
 ) -> Dict[str, list]:
@@ -29,33 +358,290 @@ def get_cached_movies_with_people(
     Get the dict of movies with people if it exists in the cache
     else returns an empty dict {}.
     """  # noqa
-    cache = conn.hget(
+    _, cache = read_cache(redis_conn)
+    return json.loads(cache.decode('utf-8')) if cache else {}
+
+
+def get_stale_movies_with_people(
+    redis_conn: redis.StrictRedis = conn,
+) -> Dict[str, list]:
+    """
+    Get the dict of movies with people of the last refill even if the cache
+    expired, else returns an empty dict {}.
+    """
+    stale = redis_conn.hget(settings.REDIS_HASH_UPSTREAM, 'payload')
+    return json.loads(stale.decode('utf-8')) if stale else {}
+
+
+def get_published_version_key() -> str:
+    """Get the key storing the last version published to the subscribers"""
+    return f'{settings.REDIS_CHANNEL_UPDATES}:version'
+
+
+def get_published_movies_with_people(
+    published_version: Optional[str],
+    redis_conn: redis.StrictRedis = conn,
+) -> Dict[str, list]:
+    """
+    Get the dict of movies with people of the last version published to the
+    subscribers if it is still stored, else returns an empty dict {}.
+    """
+    if published_version is None:
+        return {}
+    published = redis_conn.get(get_cache_version_key(published_version))
+    if published is None:
+        stale = redis_conn.hget(settings.REDIS_HASH_UPSTREAM, 'payload')
+        if stale and get_payload_version(stale.decode('utf-8')) == published_version:  # noqa
+            published = stale
+    return json.loads(published.decode('utf-8')) if published else {}
+
+
+def get_missed_update(
+    last_version: Optional[str],
+    redis_conn: redis.StrictRedis = conn,
+) -> Optional[str]:
+    """
+    Get the serialized update missed by a subscriber which last received
+    `last_version`: the last version published with the movies changed since
+    `last_version`, or all the movies if it is unknown or no longer stored.
+    It returns None if nothing was published or if the subscriber already
+    has the last version.
+    """
+    published_version = redis_conn.get(get_published_version_key())
+    if published_version is None:
+        return None
+    published_version = published_version.decode('utf-8')
+    if published_version == last_version:
+        return None
+    return json.dumps({
+        'version': published_version,
+        'changed': get_changed_movies(
+            get_published_movies_with_people(last_version, redis_conn),
+            get_published_movies_with_people(published_version, redis_conn),
+        ),
+    })
+
+
+def publish_cache_version(
+    pipeline: redis.client.Pipeline,
+    version: str,
+    raw_payload: str,
+    redis_conn: redis.StrictRedis = conn,
+) -> None:
+    """
+    Add to a pipeline the commands writing a payload under the key of its
+    version then swapping the pointer of the cache to that version.
+    The previous version is kept `CACHE_GRACE_SECONDS` longer than the pointer
+    so that the readers which got the previous pointer can still read it.
+    If the payload isn't empty and its version isn't the last one published,
+    its version and the changed movies are published to the subscribers
+    of the updates.
+    """
+    life_milliseconds = get_cache_life_milliseconds()
+    pipeline.set(
+        get_cache_version_key(version),
+        raw_payload,
+        px=life_milliseconds + int(settings.CACHE_GRACE_SECONDS) * 1000,
+    )
+    pipeline.hset(
         settings.REDIS_HASH_CACHE,
-        settings.REDIS_HASH_CACHE_KEY
+        settings.REDIS_HASH_CACHE_KEY,
+        version,
     )
-    return json.loads(cache.decode('utf-8')) if cache else {}
+    pipeline.pexpire(settings.REDIS_HASH_CACHE, life_milliseconds)
+
+    # An empty payload means the API failed, it is not worth an update
+    if raw_payload == json.dumps({}):
+        return
+    published_version = redis_conn.get(get_published_version_key())
+    if published_version is not None:
+        published_version = published_version.decode('utf-8')
+    if version == published_version:
+        return
+    pipeline.publish(
+        settings.REDIS_CHANNEL_UPDATES,
+        json.dumps({
+            'version': version,
+            'changed': get_changed_movies(
+                get_published_movies_with_people(
+                    published_version,
+                    redis_conn,
+                ),
+                json.loads(raw_payload),
+            ),
+        }),
+    )
+    pipeline.set(get_published_version_key(), version)
 
 
 def set_cache_movies_with_people(
     payload: Dict[str, list],
     redis_conn: redis.StrictRedis = conn,
+    upstream_state: Optional[Dict[str, Union[str, bytes]]] = None,
 ) -> bool:
     """
-    Set the dict of movies with people even if it already exists in the cache
-    and returns True if the cache exists, False otherwise.
+    Set the dict of movies with people under a new version of the cache
+    even if it already exists and returns True if the cache exists,
+    False otherwise.
+    If the upstream state (validators and bodies of the ghibli API responses)
+    is given, it is replaced along with the payload so that the next refill
+    can be made conditionally.
     """
-    nb_keys_set = redis_conn.hset(
-        settings.REDIS_HASH_CACHE,
-        settings.REDIS_HASH_CACHE_KEY,
-        json.dumps(payload)
+    raw_payload = json.dumps(payload)
+
+    # Everything is written in a transaction: readers see either the
+    # previous version or the new one, never a missing cache
+    pipeline = redis_conn.pipeline()
+    publish_cache_version(
+        pipeline,
+        get_payload_version(raw_payload),
+        raw_payload,
+        redis_conn,
     )
-    redis_conn.expire(
-        settings.REDIS_HASH_CACHE,
-        settings.CACHE_LIFE_SECONDS,
+    if upstream_state is not None:
+        pipeline.delete(settings.REDIS_HASH_UPSTREAM)
+        pipeline.hset(
+            settings.REDIS_HASH_UPSTREAM,
+            mapping={**upstream_state, 'payload': raw_payload},
+        )
+    _, nb_keys_set, *_ = pipeline.execute()
+    return bool(nb_keys_set)
+
+
+def get_payload_version(raw_payload: str) -> str:
+    """Get the version of a serialized payload as a hash of its content"""
+    return hashlib.sha1(raw_payload.encode('utf-8')).hexdigest()
+
+
+def get_changed_movies(
+    previous_payload: Dict[str, list],
+    payload: Dict[str, list],
+) -> List[str]:
+    """
+    Get the names of the movies added, removed or whose people changed
+    between two dicts of movies with people.
+    """
+    return sorted(
+        name for name in previous_payload.keys() | payload.keys()
+        if previous_payload.get(name) != payload.get(name)
+    )
+
+
+def touch_cache_movies_with_people(
+    raw_payload: bytes,
+    redis_conn: redis.StrictRedis = conn,
+) -> bool:
+    """
+    Put back an already serialized payload in the cache and extend its life
+    without parsing it again unless it has to be published to the
+    subscribers. It returns True if the cache exists, False otherwise.
+    """
+    raw_payload = raw_payload.decode('utf-8')
+    pipeline = redis_conn.pipeline()
+    publish_cache_version(
+        pipeline,
+        get_payload_version(raw_payload),
+        raw_payload,
+        redis_conn,
     )
+    _, nb_keys_set, *_ = pipeline.execute()
     return bool(nb_keys_set)
 
 
+def refill_movies_with_people(
+    redis_conn: redis.StrictRedis = conn,
+) -> Dict[str, list]:
+    """
+    Get all the movies with the characters associated with it from the
+    ghibli API and set them in the cache.
+    It raises UpstreamRateLimited if the API can't be requested.
+    """
+    # The upstream data rarely changes: the API is requested conditionally
+    # to the last refill and the previous payload is reused if possible
+    state = get_stored_validators(redis_conn)
+    films_response, films_modified = get_if_modified(
+        'films', state, redis_conn
+    )
+    # Same as before, people are useless without films
+    if films_response.status_code not in (200, 304):
+        set_cache_movies_with_people(payload={}, redis_conn=redis_conn)
+        return {}
+    people_response, people_modified = get_if_modified(
+        'people', state, redis_conn
+    )
+    if state and not (films_modified or people_modified):
+        raw_payload, stored_version = redis_conn.hmget(
+            settings.REDIS_HASH_UPSTREAM,
+            'payload',
+            'catalog_version',
+        )
+        touch_cache_movies_with_people(raw_payload, redis_conn)
+        # The catalog may not have been stored by the last refill, or the
+        # database may be new or reset since it was
+        catalog_version = get_catalog_version(state)
+        if (
+            stored_version is None
+            or stored_version.decode('utf-8') != catalog_version
+            or not is_catalog_stored()
+        ):
+            films_body, people_body = redis_conn.hmget(
+                settings.REDIS_HASH_UPSTREAM,
+                'films_body',
+                'people_body',
+            )
+            if sync_catalog(json.loads(films_body), json.loads(people_body)):
+                redis_conn.hset(
+                    settings.REDIS_HASH_UPSTREAM,
+                    'catalog_version',
+                    catalog_version,
+                )
+        return json.loads(raw_payload.decode('utf-8'))
+    if people_response.status_code not in (200, 304):
+        set_cache_movies_with_people(payload={}, redis_conn=redis_conn)
+        return {}
+
+    # A 304 has no content, the body of the last refill is used instead
+    upstream_state = {}
+    bodies = {}
+    for endpoint, response in (
+        ('films', films_response),
+        ('people', people_response),
+    ):
+        if response.status_code == 304:
+            bodies[endpoint] = redis_conn.hget(
+                settings.REDIS_HASH_UPSTREAM,
+                f'{endpoint}_body',
+            )
+            upstream_state.update({
+                key: value for key, value in state.items()
+                if key.startswith(f'{endpoint}_')
+            })
+            upstream_state[f'{endpoint}_body'] = bodies[endpoint]
+        else:
+            bodies[endpoint] = response.content
+            upstream_state.update({
+                **get_upstream_validators(endpoint, response),
+                f'{endpoint}_body': response.content,
+            })
+
+    raw_movies = json.loads(bodies['films'])
+    raw_people = json.loads(bodies['people'])
+    movies = join_movies_with_people(
+        parse_movies_with_id(raw_movies),
+        raw_people,
+    )
+    # Recorded only once stored so that the next refills store it otherwise
+    if sync_catalog(raw_movies, raw_people):
+        upstream_state['catalog_version'] = get_catalog_version(upstream_state)
+
+    set_cache_movies_with_people(
+        payload=movies,
+        redis_conn=redis_conn,
+        upstream_state=upstream_state,
+    )
+    return movies
+
+
 def get_movies_with_people(redis_conn: redis.StrictRedis = conn) -> Dict[str, list]:  # noqa
     """
     Get all the movies with the characters associated with it.
@@ -63,7 +649,7 @@ def get_movies_with_people(redis_conn: redis.StrictRedis = conn) -> Dict[str, li
     if the API returns a valid result. Otherwise it returns an empty dict.
     """
     cache_movie_lock = redis.lock.Lock(
-        conn,
+        redis_conn,
         'get_movie_lock',
         blocking_timeout=3
     )
@@ -79,34 +665,16 @@ def get_movies_with_people(redis_conn: redis.StrictRedis = conn) -> Dict[str, li
     # Start lock here because the lock has to be taken
     # only when cached_data is being retrieved from the distant API
     # See: https://en.wikipedia.org/wiki/Thundering_herd_problem
-    with cache_movie_lock:
-        # If the thread was locked then it needs to check if another client
-        # successfully cached information otherwise it tries to retrieve it
-        cached_data = get_cached_movies_with_people(redis_conn)
-        if cached_data:
-            return cached_data
-        movies = {}
-        movies_by_id = get_movies_with_id()
-
-        if movies_by_id:
-            response = requests.get(
-                'https://ghibliapi.herokuapp.com/people'
-            )
-            people_w_movie = response.json()
-            if response.status_code == 200:
-                movies = {name: [] for id, name in movies_by_id.items()}
-                for person in people_w_movie:
-                    # Sometime the API send back a wrong id without contextual  # noqa
-                    # information and impossible to reach by id with the people API  # noqa
-                    if all(key in person for key in ("films", "name")):
-                        for movie in person['films']:
-                            movie_id = movie.split('/')[-1]
-                            movie_name = movies_by_id[movie_id]
-                            if movie_name in movies:
-                                movies[movie_name].append(person['name'])
-                            else:
-                                movies[movie_name] = [person['name']]
-
-        set_cache_movies_with_people(payload=movies, redis_conn=redis_conn)
-        # End lock
-    return movies
+    try:
+        with cache_movie_lock:
+            # If the thread was locked then it needs to check if another client
+            # successfully cached information otherwise it tries to retrieve it
+            cached_data = get_cached_movies_with_people(redis_conn)
+            if cached_data:
+                return cached_data
+
+            return refill_movies_with_people(redis_conn)
+    except (UpstreamRateLimited, redis.exceptions.LockError):
+        # Outdated data is served rather than blocking the client
+        # when another client is too long to refill or the API is busy
+        return get_stale_movies_with_people(redis_conn)
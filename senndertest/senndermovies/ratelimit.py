@@ -0,0 +1,48 @@
+import uuid
+
+import redis
+
+from django.conf import settings
+
+
+# Sliding window log: the calls of the last period are kept in a sorted set
+# scored by timestamp. The check and the insertion have to be atomic to be
+# shared by all the workers, hence the lua script. The timestamp is taken
+# from the clock of redis so that the workers don't depend on their own.
+SLIDING_WINDOW_SCRIPT = """
+local time = redis.call('TIME')
+local now = tonumber(time[1]) + tonumber(time[2]) / 1000000
+local period = tonumber(ARGV[1])
+redis.call('ZREMRANGEBYSCORE', KEYS[1], '-inf', now - period)
+if redis.call('ZCARD', KEYS[1]) >= tonumber(ARGV[2]) then
+    return 0
+end
+redis.call('ZADD', KEYS[1], now, ARGV[3])
+redis.call('EXPIRE', KEYS[1], math.ceil(period))
+return 1
+"""
+# Registered once, the client given on each call is only used to run it
+sliding_window = redis.StrictRedis(settings.REDIS_HOST).register_script(
+    SLIDING_WINDOW_SCRIPT
+)
+
+
+class UpstreamRateLimited(Exception):
+    """Raised when a call to the ghibli API would exceed its rate limit"""
+
+
+def acquire_upstream_call(endpoint: str, redis_conn: redis.StrictRedis) -> bool:  # noqa
+    """
+    Count a call to an endpoint of the ghibli API in the window shared
+    by all the workers through redis.
+    It returns True if the call is allowed by the limit configured for the
+    endpoint in `UPSTREAM_RATE_LIMITS` (or if there is none), False otherwise.
+    """
+    if endpoint not in settings.UPSTREAM_RATE_LIMITS:
+        return True
+    nb_calls, period = settings.UPSTREAM_RATE_LIMITS[endpoint]
+    return bool(sliding_window(
+        keys=[f'upstream_rate_limit:{endpoint}'],
+        args=[period, nb_calls, uuid.uuid4().hex],
+        client=redis_conn,
+    ))
@@ -1,27 +1,46 @@
 import json
 import httpretty
+from unittest import mock
+import redis
+import requests
 from redis import StrictRedis
 from copy import deepcopy
 from time import sleep
 
-from django.test import TestCase, Client
+from django.db import DatabaseError, connection
+from django.test import Client, LiveServerTestCase, TestCase
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from django.conf import settings
 
 from .processing import (
-    get_movies_with_id,
+    parse_movies_with_id,
     get_movies_with_people,
     get_cached_movies_with_people,
     set_cache_movies_with_people,
+    get_upstream_state,
+    get_stored_validators,
+    get_payload_version,
+    get_stored_movies_with_people,
+    store_catalog,
+    get_cache_life_milliseconds,
 )
+from .models import Casting, Film, Person
+from .catalog import Catalog, get_catalog
+from .updates import END_OF_UPDATES, MovieUpdates
+from .views import stream_movie_updates
+from .ratelimit import acquire_upstream_call
 
 from .utils_tests import (
     reset_cache,
+    expire_cache,
     mock_movies_api,
     mock_people_api,
+    film_body,
     people_body,
     new_valid_person,
     get_movie_cache_basic,
+    get_movie_cache_version,
     set_movie_cache_basic,
     conn,
     cache_payloads_ok,
@@ -37,19 +56,16 @@ class TestFilmsById(TestCase):
     def test_returns_empty_dict_if_not_200(self):
         mock_movies_api(status=400)
 
-        movies_with_id = get_movies_with_id()
-        self.assertEqual(movies_with_id, {})
+        movies_with_people = get_movies_with_people()
+        self.assertEqual(movies_with_people, {})
 
-    @httpretty.activate
     def test_accurately_converts_source_api(self):
         expected_output = {
             "2baf70d1-42bb-4437-b551-e5fed5a87abe": "Castle in the Sky",  # noqa
             "12cfb892-aac0-4c5b-94af-521852e46d6a": "Grave of the Fireflies",
             "12cfb892-aac0-4c5b-94af-521432e45c6b": "Film without people",
         }
-        mock_movies_api()
-
-        movies_with_id = get_movies_with_id()
+        movies_with_id = parse_movies_with_id(json.loads(film_body))
         self.assertEqual(movies_with_id, expected_output)
 
 
@@ -126,13 +142,7 @@ class TestFilmsWithPeople(TestCase):
         self.assertEqual(conn.exists(settings.REDIS_HASH_CACHE), 0)
         movies_with_people = get_movies_with_people()
         self.assertEqual(conn.exists(settings.REDIS_HASH_CACHE), 1)
-        self.assertEqual(
-            movies_with_people,
-            json.loads(conn.hget(
-                settings.REDIS_HASH_CACHE,
-                settings.REDIS_HASH_CACHE_KEY
-            ).decode('utf-8'))  # noqa
-        )
+        self.assertEqual(movies_with_people, get_movie_cache_basic())
 
     @httpretty.activate
     def test_cache_read(self):
@@ -172,6 +182,333 @@ class TestFilmsWithPeople(TestCase):
         pass
 
 
+class TestConditionalRefill(TestCase):
+
+    def tearDown(self):
+        reset_cache()
+
+    @httpretty.activate
+    def test_validators_stored(self):
+        mock_movies_api(headers={'ETag': '"films-v1"'})
+        mock_people_api(headers={'Last-Modified': 'Wed, 21 Oct 2015 07:28:00 GMT'})  # noqa
+
+        movies_with_people = get_movies_with_people()
+        state = get_upstream_state()
+        self.assertEqual(state['films_etag'], b'"films-v1"')
+        self.assertEqual(
+            state['people_last_modified'],
+            b'Wed, 21 Oct 2015 07:28:00 GMT'
+        )
+        self.assertIn('films_hash', state)
+        self.assertIn('people_hash', state)
+        self.assertEqual(
+            movies_with_people,
+            json.loads(state['payload'].decode('utf-8'))
+        )
+
+    @httpretty.activate
+    def test_stored_validators_without_bodies(self):
+        mock_movies_api(headers={'ETag': '"films-v1"'})
+        mock_people_api()
+        get_movies_with_people()
+
+        self.assertEqual(
+            sorted(get_stored_validators()),
+            ['films_etag', 'films_hash', 'people_hash']
+        )
+        conn.hdel(settings.REDIS_HASH_UPSTREAM, 'people_body')
+        self.assertEqual(get_stored_validators(), {})
+
+    @httpretty.activate
+    def test_validators_not_stored_if_not_200(self):
+        mock_movies_api()
+        mock_people_api(status=400)
+
+        get_movies_with_people()
+        self.assertEqual(get_upstream_state(), {})
+
+    @httpretty.activate
+    def test_not_modified_extends_cache(self):
+        mock_movies_api(headers={'ETag': '"films-v1"'})
+        mock_people_api(headers={'ETag': '"people-v1"'})
+        movies_with_people = get_movies_with_people()
+
+        expire_cache()
+        mock_movies_api(status=304, body=' ')
+        mock_people_api(status=304, body=' ')
+        with mock.patch(
+            'senndermovies.processing.join_movies_with_people'
+        ) as join, mock.patch.object(StrictRedis, 'hgetall') as hgetall:
+            refilled_movies_with_people = get_movies_with_people()
+            join.assert_not_called()
+            # Only the validators are read, not the whole upstream state
+            hgetall.assert_not_called()
+
+        self.assertEqual(
+            httpretty.last_request().headers['If-None-Match'],
+            '"people-v1"'
+        )
+        self.assertEqual(movies_with_people, refilled_movies_with_people)
+        self.assertEqual(conn.exists(settings.REDIS_HASH_CACHE), 1)
+        self.assertGreater(conn.ttl(settings.REDIS_HASH_CACHE), 0)
+
+    @httpretty.activate
+    def test_same_content_hash_extends_cache(self):
+        mock_movies_api()
+        mock_people_api()
+        movies_with_people = get_movies_with_people()
+
+        expire_cache()
+        with mock.patch(
+            'senndermovies.processing.join_movies_with_people'
+        ) as join:
+            refilled_movies_with_people = get_movies_with_people()
+            join.assert_not_called()
+
+        self.assertEqual(movies_with_people, refilled_movies_with_people)
+        self.assertEqual(conn.exists(settings.REDIS_HASH_CACHE), 1)
+
+    @httpretty.activate
+    def test_partially_modified_refills_cache(self):
+        mock_movies_api(headers={'ETag': '"films-v1"'})
+        mock_people_api()
+        get_movies_with_people()
+
+        expire_cache()
+        mock_movies_api(status=304, body=' ')
+        changed_people_body = deepcopy(json.loads(people_body))
+        changed_people_body.append(new_valid_person)
+        mock_people_api(body=json.dumps(changed_people_body))
+
+        refilled_movies_with_people = get_movies_with_people()
+        # The films of the 304 response are read from the upstream state
+        # instead of being downloaded again
+        self.assertEqual(len(httpretty.latest_requests()), 4)
+        self.assertIn(
+            new_valid_person['name'],
+            refilled_movies_with_people['Castle in the Sky']
+        )
+        self.assertEqual(
+            get_upstream_state()['films_etag'],
+            b'"films-v1"'
+        )
+
+        expire_cache()
+        mock_people_api(status=304, body=' ')
+        self.assertEqual(get_movies_with_people(), refilled_movies_with_people)
+
+    @httpretty.activate
+    def test_people_not_requested_if_films_not_200(self):
+        mock_movies_api(status=500)
+        mock_people_api()
+
+        self.assertEqual(get_movies_with_people(), {})
+        self.assertEqual(httpretty.last_request().path, '/films')
+
+
+class TestUpstreamRateLimit(TestCase):
+
+    def tearDown(self):
+        reset_cache()
+
+    def test_calls_limited_per_endpoint(self):
+        with self.settings(UPSTREAM_RATE_LIMITS={'films': (2, 60)}):
+            self.assertTrue(acquire_upstream_call('films', conn))
+            self.assertTrue(acquire_upstream_call('films', conn))
+            self.assertFalse(acquire_upstream_call('films', conn))
+            for _ in range(3):
+                self.assertTrue(acquire_upstream_call('people', conn))
+
+    def test_calls_allowed_after_period(self):
+        with self.settings(UPSTREAM_RATE_LIMITS={'films': (1, 1)}):
+            self.assertTrue(acquire_upstream_call('films', conn))
+            self.assertFalse(acquire_upstream_call('films', conn))
+            sleep(1)
+            self.assertTrue(acquire_upstream_call('films', conn))
+
+    def test_calls_timed_by_redis(self):
+        with self.settings(UPSTREAM_RATE_LIMITS={'films': (2, 60)}), \
+                mock.patch('time.time', return_value=0):
+            self.assertTrue(acquire_upstream_call('films', conn))
+        seconds, microseconds = conn.time()
+        (_, called_at), = conn.zrange(
+            'upstream_rate_limit:films', 0, -1, withscores=True
+        )
+        self.assertAlmostEqual(
+            called_at, seconds + microseconds / 1000000, delta=1
+        )
+
+    @httpretty.activate
+    def test_rate_limited_returns_empty_dict(self):
+        mock_movies_api()
+        mock_people_api()
+
+        with self.settings(UPSTREAM_RATE_LIMITS={'films': (0, 60)}):
+            self.assertEqual(get_movies_with_people(), {})
+        self.assertEqual(conn.exists(settings.REDIS_HASH_CACHE), 0)
+
+    @httpretty.activate
+    def test_rate_limited_returns_stale_data(self):
+        mock_movies_api()
+        mock_people_api()
+        movies_with_people = get_movies_with_people()
+
+        expire_cache()
+        with self.settings(UPSTREAM_RATE_LIMITS={'people': (0, 60)}):
+            stale_movies_with_people = get_movies_with_people()
+        self.assertEqual(movies_with_people, stale_movies_with_people)
+        self.assertEqual(conn.exists(settings.REDIS_HASH_CACHE), 0)
+
+
+class TestCatalogStorage(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.raw_movies = json.loads(film_body)
+        cls.raw_people = json.loads(people_body)
+
+    def tearDown(self):
+        reset_cache()
+
+    @httpretty.activate
+    def test_catalog_stored_on_refill(self):
+        mock_movies_api()
+        mock_people_api()
+
+        movies_with_people = get_movies_with_people()
+        self.assertEqual(Film.objects.count(), 3)
+        self.assertEqual(Person.objects.count(), 3)
+        self.assertEqual(Casting.objects.count(), 3)
+        self.assertEqual(get_stored_movies_with_people(), movies_with_people)
+
+    @httpretty.activate
+    def test_catalog_not_stored_if_not_200(self):
+        mock_movies_api()
+        mock_people_api(status=400)
+
+        get_movies_with_people()
+        self.assertEqual(Film.objects.count(), 0)
+        self.assertEqual(get_stored_movies_with_people(), {})
+
+    @httpretty.activate
+    def test_catalog_stored_if_empty_on_unchanged_refill(self):
+        mock_movies_api(headers={'ETag': '"films-v1"'})
+        mock_people_api(headers={'ETag': '"people-v1"'})
+        movies_with_people = get_movies_with_people()
+
+        # The database is reset while the upstream state is kept
+        Film.objects.all().delete()
+        Person.objects.all().delete()
+        expire_cache()
+        mock_movies_api(status=304, body=' ')
+        mock_people_api(status=304, body=' ')
+        get_movies_with_people()
+        self.assertEqual(get_stored_movies_with_people(), movies_with_people)
+
+    @httpretty.activate
+    def test_catalog_stored_on_unchanged_refill_after_failure(self):
+        mock_movies_api(headers={'ETag': '"films-v1"'})
+        mock_people_api(headers={'ETag': '"people-v1"'})
+        get_movies_with_people()
+
+        expire_cache()
+        changed_people_body = deepcopy(json.loads(people_body))
+        changed_people_body.append(new_valid_person)
+        mock_people_api(
+            body=json.dumps(changed_people_body),
+            headers={'ETag': '"people-v2"'},
+        )
+        with mock.patch(
+            'senndermovies.processing.store_catalog',
+            side_effect=DatabaseError,
+        ):
+            movies_with_people = get_movies_with_people()
+        self.assertNotEqual(
+            get_stored_movies_with_people(),
+            movies_with_people
+        )
+
+        expire_cache()
+        mock_movies_api(status=304, body=' ')
+        mock_people_api(status=304, body=' ')
+        get_movies_with_people()
+        self.assertEqual(get_stored_movies_with_people(), movies_with_people)
+
+        # Once stored, the catalog isn't written again by unchanged refills
+        expire_cache()
+        with mock.patch('senndermovies.processing.store_catalog') as store:
+            get_movies_with_people()
+            store.assert_not_called()
+
+    @httpretty.activate
+    def test_cache_refilled_if_database_unavailable(self):
+        mock_movies_api()
+        mock_people_api()
+
+        with mock.patch(
+            'senndermovies.processing.store_catalog',
+            side_effect=DatabaseError,
+        ):
+            movies_with_people = get_movies_with_people()
+        self.assertEqual(movies_with_people, get_movie_cache_basic())
+        self.assertEqual(Film.objects.count(), 0)
+
+    def test_unchanged_catalog_not_written(self):
+        store_catalog(self.raw_movies, self.raw_people)
+        with CaptureQueriesContext(connection) as queries:
+            store_catalog(self.raw_movies, self.raw_people)
+        self.assertFalse([
+            query for query in queries.captured_queries
+            if query['sql'].startswith(('INSERT', 'UPDATE', 'DELETE'))
+        ])
+
+    def test_changed_rows_written(self):
+        store_catalog(self.raw_movies, self.raw_people)
+        raw_people = deepcopy(self.raw_people)
+        raw_people[0]['name'] = 'Ashitaka renamed'
+        raw_people[0]['films'] = raw_people[0]['films'][:1]
+        raw_people.append(new_valid_person)
+        store_catalog(self.raw_movies[:2], raw_people)
+
+        self.assertEqual(get_stored_movies_with_people(), {
+            "Castle in the Sky": [
+                "Ashitaka renamed",
+                "Lusheeta Toel Ul Laputa",
+                "new_valid_person",
+            ],
+            "Grave of the Fireflies": [],
+        })
+        self.assertFalse(Film.objects.filter(title='Film without people'))
+
+    def test_stored_movies_filtered_by_nb_people(self):
+        store_catalog(self.raw_movies, self.raw_people)
+        self.assertEqual(
+            list(get_stored_movies_with_people(min_people=1)),
+            ["Castle in the Sky", "Grave of the Fireflies"]
+        )
+        self.assertEqual(
+            list(get_stored_movies_with_people(min_people=2)),
+            ["Castle in the Sky"]
+        )
+
+    def test_stored_view(self):
+        store_catalog(self.raw_movies, self.raw_people)
+        response = Client().get(
+            reverse('movie_list_stored'),
+            {'min_people': 2}
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response.context['movie_list'].as_dict(),
+            get_stored_movies_with_people(min_people=2)
+        )
+        response = Client().get(
+            reverse('movie_list_stored'),
+            {'min_people': 'many'}
+        )
+        self.assertEqual(response.status_code, 400)
+
+
 class TestSetMovieCache(TestCase):
 
     def setUp(self):
@@ -222,6 +559,275 @@ class TestSetMovieCache(TestCase):
         self.assertEqual(conn.exists(settings.REDIS_HASH_CACHE), 0)
 
 
+class TestMovieUpdates(TestCase):
+
+    def setUp(self):
+        self.pubsub = conn.pubsub(ignore_subscribe_messages=True)
+        self.pubsub.subscribe(settings.REDIS_CHANNEL_UPDATES)
+
+    def tearDown(self):
+        self.pubsub.close()
+        reset_cache()
+
+    def get_update(self):
+        for _ in range(10):
+            message = self.pubsub.get_message(timeout=0.1)
+            if message:
+                return json.loads(message['data'].decode('utf-8'))
+        return None
+
+    def test_update_published_on_new_payload(self):
+        set_cache_movies_with_people(cache_payloads_ok[0], conn)
+        self.assertEqual(self.get_update(), {
+            'version': get_payload_version(json.dumps(cache_payloads_ok[0])),
+            'changed': sorted(cache_payloads_ok[0]),
+        })
+
+        payload = deepcopy(cache_payloads_ok[0])
+        payload['some_other_movie'].append('person2')
+        set_cache_movies_with_people(payload, conn)
+        self.assertEqual(
+            self.get_update()['changed'],
+            ['some_other_movie']
+        )
+
+    def test_no_update_on_same_payload(self):
+        set_cache_movies_with_people(cache_payloads_ok[0], conn)
+        self.assertIsNotNone(self.get_update())
+        set_cache_movies_with_people(cache_payloads_ok[0], conn)
+        self.assertIsNone(self.get_update())
+
+    def test_no_update_on_empty_payload(self):
+        set_cache_movies_with_people({}, conn)
+        self.assertIsNone(self.get_update())
+
+    @httpretty.activate
+    def test_no_update_on_failed_then_recovered_refill(self):
+        mock_movies_api(headers={'ETag': '"films-v1"'})
+        mock_people_api(headers={'ETag': '"people-v1"'})
+        movies_with_people = get_movies_with_people()
+        self.assertIsNotNone(self.get_update())
+
+        # The API briefly fails: the empty payload isn't published
+        expire_cache()
+        mock_movies_api(status=304, body=' ')
+        mock_people_api(status=500)
+        self.assertEqual(get_movies_with_people(), {})
+        self.assertIsNone(self.get_update())
+
+        # Subscribers already have the version restored after recovery
+        mock_people_api(status=304, body=' ')
+        self.assertEqual(get_movies_with_people(), movies_with_people)
+        self.assertIsNone(self.get_update())
+        self.assertEqual(
+            get_movie_cache_version(),
+            get_payload_version(json.dumps(movies_with_people))
+        )
+
+    @httpretty.activate
+    def test_update_published_on_restored_version(self):
+        mock_movies_api(headers={'ETag': '"films-v1"'})
+        mock_people_api(headers={'ETag': '"people-v1"'})
+        movies_with_people = get_movies_with_people()
+        set_cache_movies_with_people(cache_payloads_ok[0], conn)
+        self.get_update()
+        self.get_update()
+
+        expire_cache()
+        mock_movies_api(status=304, body=' ')
+        mock_people_api(status=304, body=' ')
+        get_movies_with_people()
+        self.assertEqual(self.get_update(), {
+            'version': get_payload_version(json.dumps(movies_with_people)),
+            'changed': sorted(
+                movies_with_people.keys() | cache_payloads_ok[0].keys()
+            ),
+        })
+
+    def test_stream_pushes_updates(self):
+        response = Client().get(reverse('movie_updates'))
+        self.assertEqual(response['Content-Type'], 'text/event-stream')
+        events = iter(response.streaming_content)
+        self.assertEqual(next(events), b'retry: 5000\n\n')
+
+        set_cache_movies_with_people(cache_payloads_ok[2], conn)
+        version = get_payload_version(json.dumps(cache_payloads_ok[2]))
+        event = next(events).decode('utf-8')
+        response.close()
+        self.assertTrue(event.startswith(
+            f'id: {version}\nevent: movies\ndata: '
+        ))
+        self.assertEqual(
+            json.loads(event.split('data: ')[1])['changed'],
+            ['override_done']
+        )
+
+    def test_stream_starts_with_missed_update(self):
+        set_cache_movies_with_people(cache_payloads_ok[0], conn)
+        first_version = self.get_update()['version']
+        # Published while the client was disconnected
+        set_cache_movies_with_people(cache_payloads_ok[2], conn)
+        missed_update = self.get_update()
+
+        response = Client().get(
+            reverse('movie_updates'),
+            HTTP_LAST_EVENT_ID=first_version,
+        )
+        events = iter(response.streaming_content)
+        next(events)
+        event = next(events).decode('utf-8')
+        response.close()
+        self.assertTrue(event.startswith(
+            f'id: {missed_update["version"]}\nevent: movies\ndata: '
+        ))
+        self.assertEqual(json.loads(event.split('data: ')[1]), missed_update)
+
+    def test_stream_starts_with_last_version_without_id(self):
+        set_cache_movies_with_people(cache_payloads_ok[0], conn)
+        version = get_payload_version(json.dumps(cache_payloads_ok[0]))
+
+        response = Client().get(reverse('movie_updates'))
+        events = iter(response.streaming_content)
+        next(events)
+        event = next(events).decode('utf-8')
+        response.close()
+        self.assertTrue(event.startswith(f'id: {version}\n'))
+        self.assertEqual(
+            json.loads(event.split('data: ')[1])['changed'],
+            sorted(cache_payloads_ok[0])
+        )
+
+    def test_stream_skips_last_version_of_client(self):
+        set_cache_movies_with_people(cache_payloads_ok[0], conn)
+        version = get_payload_version(json.dumps(cache_payloads_ok[0]))
+
+        response = Client().get(
+            reverse('movie_updates'),
+            HTTP_LAST_EVENT_ID=version,
+        )
+        events = iter(response.streaming_content)
+        next(events)
+        set_cache_movies_with_people(cache_payloads_ok[2], conn)
+        event = next(events).decode('utf-8')
+        response.close()
+        self.assertFalse(event.startswith(f'id: {version}\n'))
+
+
+class TestMovieUpdatesServer(LiveServerTestCase):
+
+    def tearDown(self):
+        reset_cache()
+
+    def get_event_version(self, lines):
+        for line in lines:
+            if line.startswith(b'id: '):
+                return line[len(b'id: '):].decode('utf-8')
+
+    def test_requests_served_while_streaming(self):
+        set_cache_movies_with_people(cache_payloads_ok[0], conn)
+        with requests.get(
+            self.live_server_url + reverse('movie_updates'),
+            stream=True,
+            timeout=5,
+        ) as stream:
+            lines = stream.iter_lines(chunk_size=1)
+            self.assertEqual(
+                self.get_event_version(lines),
+                get_payload_version(json.dumps(cache_payloads_ok[0]))
+            )
+
+            # The open stream doesn't hold back the other requests
+            response = requests.get(
+                self.live_server_url + reverse('movie_list'),
+                timeout=5,
+            )
+            self.assertEqual(response.status_code, 200)
+            self.assertIn('some_movie', response.text)
+
+            set_cache_movies_with_people(cache_payloads_ok[2], conn)
+            self.assertEqual(
+                self.get_event_version(lines),
+                get_payload_version(json.dumps(cache_payloads_ok[2]))
+            )
+
+
+class TestCacheVersions(TestCase):
+
+    def tearDown(self):
+        reset_cache()
+
+    def test_new_version_swapped_in(self):
+        set_cache_movies_with_people(cache_payloads_ok[0], conn)
+        previous_version = get_movie_cache_version()
+        set_cache_movies_with_people(cache_payloads_ok[2], conn)
+        version = get_movie_cache_version()
+
+        self.assertNotEqual(previous_version, version)
+        self.assertEqual(get_cached_movies_with_people(), cache_payloads_ok[2])
+        # The previous version can still be read by late readers
+        self.assertEqual(
+            conn.exists(f'{settings.REDIS_HASH_CACHE}:{previous_version}'),
+            1
+        )
+        self.assertGreater(
+            conn.pttl(f'{settings.REDIS_HASH_CACHE}:{version}'),
+            conn.pttl(settings.REDIS_HASH_CACHE)
+        )
+
+    def test_previous_version_expires_after_grace(self):
+        with self.settings(CACHE_LIFE_SECONDS=1, CACHE_GRACE_SECONDS=1):
+            set_cache_movies_with_people(cache_payloads_ok[0], conn)
+            version_key = (
+                f'{settings.REDIS_HASH_CACHE}:{get_movie_cache_version()}'
+            )
+            sleep(settings.CACHE_LIFE_SECONDS)
+            self.assertEqual(conn.exists(settings.REDIS_HASH_CACHE), 0)
+            self.assertEqual(conn.exists(version_key), 1)
+            sleep(settings.CACHE_GRACE_SECONDS)
+            self.assertEqual(conn.exists(version_key), 0)
+
+    def test_jittered_life(self):
+        with self.settings(CACHE_LIFE_SECONDS=100, CACHE_JITTER_RATIO=0.5):
+            lives = {get_cache_life_milliseconds() for _ in range(20)}
+        self.assertGreater(len(lives), 1)
+        for life in lives:
+            self.assertGreaterEqual(life, 50000)
+            self.assertLessEqual(life, 100000)
+
+
+class TestMovieUpdatesListener(TestCase):
+
+    def test_streams_ended_when_listener_dies(self):
+        redis_conn = mock.MagicMock()
+        redis_conn.pubsub.return_value.listen.side_effect = (
+            redis.exceptions.ConnectionError
+        )
+        updates = MovieUpdates(redis_conn)
+
+        subscriber = updates.subscribe()
+        # The stream ends so that the client reconnects
+        self.assertEqual(
+            list(stream_movie_updates(subscriber)),
+            ['retry: 5000\n\n']
+        )
+        self.assertIsNone(updates.listener)
+        self.assertEqual(updates.subscribers, set())
+
+    def test_listener_restarted_by_next_subscriber(self):
+        redis_conn = mock.MagicMock()
+        redis_conn.pubsub.return_value.subscribe.side_effect = (
+            redis.exceptions.ConnectionError
+        )
+        updates = MovieUpdates(redis_conn)
+
+        self.assertIs(updates.subscribe().get(timeout=1), END_OF_UPDATES)
+        updates.subscribe().get(timeout=1)
+        self.assertEqual(
+            redis_conn.pubsub.return_value.subscribe.call_count,
+            2
+        )
+
+
 class TestGetMovieCache(TestCase):
 
     def setUp(self):
@@ -244,6 +850,46 @@ class TestGetMovieCache(TestCase):
         self.assertEqual(cache_content, {})
 
 
+class TestCatalog(TestCase):
+
+    def tearDown(self):
+        reset_cache()
+
+    def test_people_shared_between_films(self):
+        catalog = Catalog.from_payload(cache_payloads_ok[0], 'version')
+        some_movie, some_other_movie, _ = catalog.films
+        self.assertIs(some_movie.people[0], some_other_movie.people[0])
+        self.assertEqual(catalog.version, 'version')
+        self.assertEqual(catalog.as_dict(), cache_payloads_ok[0])
+
+    def test_names_interned(self):
+        payloads = [json.loads(json.dumps(cache_payloads_ok[0]))
+                    for _ in range(2)]
+        first, second = (Catalog.from_payload(p) for p in payloads)
+        self.assertIs(first.films[0].title, second.films[0].title)
+        self.assertIs(
+            first.films[0].people[1].name,
+            second.films[0].people[1].name
+        )
+
+    def test_catalog_built_once_per_version(self):
+        set_cache_movies_with_people(cache_payloads_ok[0], conn)
+        with mock.patch(
+            'senndermovies.catalog.get_movies_with_people'
+        ) as get_movies:
+            catalog = get_catalog()
+            with mock.patch('senndermovies.catalog.read_cache') as read:
+                self.assertIs(get_catalog(), catalog)
+                read.assert_not_called()
+            get_movies.assert_not_called()
+
+        set_cache_movies_with_people(cache_payloads_ok[2], conn)
+        new_catalog = get_catalog()
+        self.assertIsNot(new_catalog, catalog)
+        self.assertEqual(new_catalog.as_dict(), cache_payloads_ok[2])
+        self.assertEqual(new_catalog.version, get_movie_cache_version())
+
+
 class TestFilmListView(TestCase):
 
     def setUp(self):
@@ -260,7 +906,10 @@ class TestFilmListView(TestCase):
         response = self.client.get(reverse('movie_list'))
         movies_with_people = get_movies_with_people()
         self.assertEqual(response.status_code, 200)
-        self.assertEqual(movies_with_people, response.context['movie_list'])
+        self.assertEqual(
+            movies_with_people,
+            response.context['movie_list'].as_dict()
+        )
         self.assertTemplateUsed(
             response,
             'senndermovies/movies_nested_list.html'
@@ -0,0 +1,88 @@
+import logging
+import queue
+import threading
+
+import redis
+
+from django.conf import settings
+
+from .processing import conn
+
+
+logger = logging.getLogger(__name__)
+
+# Received by the subscribers when the updates can't be followed anymore
+END_OF_UPDATES = None
+
+
+class MovieUpdates:
+    """
+    Fan out the updates of the movies with people published in redis to all
+    the subscribers of the process through a single redis subscription.
+    """
+
+    # Updates are dropped for a subscriber too slow to consume them
+    max_pending_updates = 100
+
+    def __init__(self, redis_conn: redis.StrictRedis = conn):
+        self.redis_conn = redis_conn
+        self.subscribers = set()
+        self.lock = threading.Lock()
+        self.listener = None
+
+    def subscribe(self) -> queue.Queue:
+        """
+        Get a queue receiving every update published from now on.
+        The listener of the redis channel is started with the first subscriber
+        (or restarted if it stopped) and this waits for it to be subscribed.
+        """
+        subscriber = queue.Queue(maxsize=self.max_pending_updates)
+        with self.lock:
+            self.subscribers.add(subscriber)
+            if self.listener is None:
+                subscribed = threading.Event()
+                self.listener = threading.Thread(
+                    target=self.listen,
+                    args=(subscribed,),
+                    daemon=True,
+                )
+                self.listener.start()
+                subscribed.wait()
+        return subscriber
+
+    def unsubscribe(self, subscriber: queue.Queue):
+        with self.lock:
+            self.subscribers.discard(subscriber)
+
+    def listen(self, subscribed: threading.Event):
+        try:
+            pubsub = self.redis_conn.pubsub(ignore_subscribe_messages=True)
+            try:
+                pubsub.subscribe(settings.REDIS_CHANNEL_UPDATES)
+            finally:
+                subscribed.set()
+            for message in pubsub.listen():
+                with self.lock:
+                    subscribers = list(self.subscribers)
+                for subscriber in subscribers:
+                    try:
+                        subscriber.put_nowait(message['data'].decode('utf-8'))
+                    except queue.Full:
+                        pass
+        except redis.exceptions.RedisError:
+            logger.exception('Subscription to the movie updates lost')
+        finally:
+            # Updates may be missed until the subscription is restored:
+            # the streams are ended so that the clients reconnect and the
+            # listener is restarted with the next subscriber
+            with self.lock:
+                subscribers = list(self.subscribers)
+                self.subscribers.clear()
+                self.listener = None
+            for subscriber in subscribers:
+                with subscriber.mutex:
+                    subscriber.queue.clear()
+                subscriber.put_nowait(END_OF_UPDATES)
+
+
+movie_updates = MovieUpdates()
@@ -1,7 +1,9 @@
 from django.urls import path
-from .views import movie_list
+from .views import movie_list, movie_list_stored, movie_updates_stream
 
 
 urlpatterns = [
     path('', movie_list, name='movie_list'),
+    path('stored/', movie_list_stored, name='movie_list_stored'),
+    path('updates/', movie_updates_stream, name='movie_updates'),
 ]
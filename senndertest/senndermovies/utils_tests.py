@@ -115,6 +115,17 @@ conn = StrictRedis(settings.REDIS_HOST)
 
 
 def reset_cache(redis_conn: StrictRedis = conn):
+    nb_keys_removed = expire_cache(redis_conn)
+    redis_conn.delete(settings.REDIS_HASH_UPSTREAM)
+    redis_conn.delete(f'{settings.REDIS_CHANNEL_UPDATES}:version')
+    for rate_limit_key in redis_conn.scan_iter('upstream_rate_limit:*'):
+        redis_conn.delete(rate_limit_key)
+    for version_key in redis_conn.scan_iter(f'{settings.REDIS_HASH_CACHE}:*'):  # noqa
+        redis_conn.delete(version_key)
+    return nb_keys_removed
+
+
+def expire_cache(redis_conn: StrictRedis = conn):
     nb_keys_removed = redis_conn.hdel(
         settings.REDIS_HASH_CACHE,
         settings.REDIS_HASH_CACHE_KEY
@@ -122,23 +133,32 @@ def reset_cache(redis_conn: StrictRedis = conn):
     return nb_keys_removed
 
 
-def get_movie_cache_basic():
-    return json.loads(conn.hget(
+def get_movie_cache_version():
+    return conn.hget(
         settings.REDIS_HASH_CACHE,
         settings.REDIS_HASH_CACHE_KEY
+    ).decode('utf-8')
+
+
+def get_movie_cache_basic():
+    return json.loads(conn.get(
+        f'{settings.REDIS_HASH_CACHE}:{get_movie_cache_version()}'
     ).decode('utf-8'))
 
 
-def set_movie_cache_basic(payload):
+def set_movie_cache_basic(payload, version='basic'):
+    conn.set(f'{settings.REDIS_HASH_CACHE}:{version}', payload)
     nb_keys_set = conn.hset(
         settings.REDIS_HASH_CACHE,
         settings.REDIS_HASH_CACHE_KEY,
-        payload,
+        version,
     )
     return nb_keys_set
 
 
-def mock_people_api(status=200, body=None, method=httpretty.GET):
+def mock_people_api(
+    status=200, body=None, method=httpretty.GET, headers=None
+):
     if not body:
         body = people_body if status == 200 else '{"message": "HTTPretty :)"}'
 
@@ -147,11 +167,14 @@ def mock_people_api(status=200, body=None, method=httpretty.GET):
         people_uri,
         body=body,
         status=status,
+        adding_headers=headers,
     )
     return body
 
 
-def mock_movies_api(status=200, body=None, method=httpretty.GET):
+def mock_movies_api(
+    status=200, body=None, method=httpretty.GET, headers=None
+):
     if not body:
         body = film_body if status == 200 else '{"message": "HTTPretty :)"}'
 
@@ -160,5 +183,6 @@ def mock_movies_api(status=200, body=None, method=httpretty.GET):
         films_uri,
         body=body,
         status=status,
+        adding_headers=headers,
     )
     return body
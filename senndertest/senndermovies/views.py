@@ -1,10 +1,97 @@
+import json
+import queue
+from typing import Optional
+
+from django.http import HttpResponseBadRequest, StreamingHttpResponse
 from django.shortcuts import render
-from .processing import get_movies_with_people
+from .catalog import Catalog, get_catalog
+from .processing import get_missed_update, get_stored_movies_with_people
+from .updates import END_OF_UPDATES, movie_updates
+
+
+# A comment is sent when nothing happened for this long so that
+# the connections closed by clients are detected and released
+HEARTBEAT_SECONDS = 15
 
 
 def movie_list(request):
     """Renders all movies with the corresponding characters as a plain list"""
     context = {
-        'movie_list': get_movies_with_people()
+        'movie_list': get_catalog()
+    }
+    return render(request, 'senndermovies/movies_nested_list.html', context)
+
+
+def movie_list_stored(request):
+    """
+    Renders the movies stored in the database with the corresponding
+    characters as a plain list, only the movies with at least
+    `min_people` characters if given.
+    """
+    try:
+        min_people = int(request.GET.get('min_people', 0))
+    except ValueError:
+        return HttpResponseBadRequest('min_people must be an integer')
+    context = {
+        'movie_list': Catalog.from_payload(
+            get_stored_movies_with_people(min_people)
+        )
     }
     return render(request, 'senndermovies/movies_nested_list.html', context)
+
+
+def stream_movie_updates(
+    subscriber: queue.Queue,
+    missed_update: Optional[str] = None,
+):
+    """
+    Yields the update missed by the client if any, then the updates received
+    by a subscriber as server-sent events until the client disconnects or
+    the updates end.
+    """
+    try:
+        yield 'retry: 5000\n\n'
+        last_version = None
+        if missed_update is not None:
+            last_version = json.loads(missed_update)['version']
+            yield f'id: {last_version}\nevent: movies\ndata: {missed_update}\n\n'  # noqa
+        while True:
+            try:
+                update = subscriber.get(timeout=HEARTBEAT_SECONDS)
+            except queue.Empty:
+                yield ': heartbeat\n\n'
+                continue
+            if update is END_OF_UPDATES:
+                return
+            version = json.loads(update)['version']
+            # Already sent as the missed update if published since then
+            if version == last_version:
+                continue
+            last_version = version
+            yield f'id: {version}\nevent: movies\ndata: {update}\n\n'
+    finally:
+        movie_updates.unsubscribe(subscriber)
+
+
+def movie_updates_stream(request):
+    """
+    Pushes the updates of the movies as server-sent events, starting with
+    the last version if the client doesn't have it yet (`Last-Event-ID`).
+    """
+    # Subscribed first so that no update is published unnoticed in between
+    subscriber = movie_updates.subscribe()
+    try:
+        missed_update = get_missed_update(
+            request.META.get('HTTP_LAST_EVENT_ID')
+        )
+    except Exception:
+        movie_updates.unsubscribe(subscriber)
+        raise
+    response = StreamingHttpResponse(
+        stream_movie_updates(subscriber, missed_update),
+        content_type='text/event-stream',
+    )
+    response['Cache-Control'] = 'no-cache'
+    # Prevents proxies like nginx from buffering the events
+    response['X-Accel-Buffering'] = 'no'
+    return response
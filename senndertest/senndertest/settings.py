@@ -34,8 +34,25 @@ else:
 REDIS_HOST = os.environ['REDIS_HOST']
 REDIS_HASH_CACHE = os.environ['REDIS_HASH_CACHE']
 REDIS_HASH_CACHE_KEY = os.environ['REDIS_HASH_CACHE_KEY']
+REDIS_HASH_UPSTREAM = os.environ['REDIS_HASH_UPSTREAM']
+REDIS_CHANNEL_UPDATES = os.environ['REDIS_CHANNEL_UPDATES']
 
 CACHE_LIFE_SECONDS = os.environ['CACHE_LIFE_SECONDS']
+# Previous versions of the cache stay readable that long after being replaced
+CACHE_GRACE_SECONDS = os.environ['CACHE_GRACE_SECONDS']
+# The life of the cache is randomly shortened by up to this ratio
+CACHE_JITTER_RATIO = os.environ['CACHE_JITTER_RATIO']
+
+# Maximum number of calls per period in seconds to each endpoint of the
+# ghibli API shared by all the workers, e.g. "films:10/60,people:10/60"
+UPSTREAM_RATE_LIMITS = {
+    endpoint: tuple(int(value) for value in limit.split('/'))
+    for endpoint, limit in (
+        rate_limit.split(':')
+        for rate_limit in os.environ['UPSTREAM_RATE_LIMITS'].split(',')
+        if rate_limit
+    )
+}
 
 ALLOWED_HOSTS = os.environ['ALLOWED_HOSTS'].split(',')
 
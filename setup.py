@@ -17,5 +17,9 @@ setup(
             'coverage',
             'flake8',
         ],
+        "deploy": [
+            'gunicorn',
+            'gevent',
+        ],
     }
 )